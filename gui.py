@@ -4,7 +4,7 @@
 """
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
 import threading
 
 
@@ -30,9 +30,14 @@ class MainApplication:
         self.root = root
         self.image_manager = image_manager
         self.histogram_manager = histogram_manager
+        self._resize_after_id = None
+        self._last_canvas_size = (0, 0)
+        self._image_item = None
+        self._current_photo = None
 
         self.setup_ui()
         self.update_display()
+        self.start_initial_load()
 
     def setup_ui(self):
         """Настраивает пользовательский интерфейс."""
@@ -80,6 +85,10 @@ class MainApplication:
         )
         self.image_canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
+        # Обновляем отображение по фактическому изменению размеров холста
+        # (включая первую раскладку окна) вместо таймера
+        self.image_canvas.bind('<Configure>', self._on_canvas_resize)
+
         # Метка для информации об изображении
         self.image_info_label = ttk.Label(image_frame, text="Загрузка...", background='#f0f0f0')
         self.image_info_label.grid(row=1, column=0, sticky=(tk.W, tk.E))
@@ -130,16 +139,37 @@ class MainApplication:
         )
         self.load_image_btn.pack(side=tk.LEFT)
 
+    def start_initial_load(self):
+        """
+        Запускает загрузку первого изображения в фоновом потоке,
+        чтобы не задерживать отрисовку главного окна.
+        """
+
+        def initial_load_thread():
+            if self.image_manager.load_initial_image():
+                self.root.after(0, self.update_display)
+            else:
+                self.root.after(0, self._show_load_error)
+
+        threading.Thread(target=initial_load_thread, daemon=True).start()
+
     def switch_image(self):
         """
         Обрабатывает нажатие кнопки смены изображения.
         """
+        if not self.image_manager.image_paths:
+            messagebox.showwarning("Предупреждение", "Нет доступных изображений в папке 'images'")
+            return
+
+        self.next_image_btn.config(state='disabled')
 
         def switch_thread():
-            self.next_image_btn.config(state='disabled')
             if self.image_manager.switch_to_next_image():
-                self.update_display()
-            self.next_image_btn.config(state='normal')
+                self.root.after(0, self.update_display)
+            else:
+                self.root.after(0, self._show_load_error)
+            # Работа с виджетами только в главном потоке
+            self.root.after(0, lambda: self.next_image_btn.config(state='normal'))
 
         # Запускаем в отдельном потоке чтобы не блокировать интерфейс
         threading.Thread(target=switch_thread, daemon=True).start()
@@ -148,16 +178,36 @@ class MainApplication:
         """
         Обрабатывает нажатие кнопки загрузки пользовательского изображения.
         """
+        # Диалог выбора файла открываем в главном потоке,
+        # в фоновый поток уходит только загрузка выбранного файла
+        file_path = filedialog.askopenfilename(
+            title="Выберите изображение",
+            filetypes=[
+                ("Изображения", "*.png *.jpg *.jpeg *.bmp *.gif"),
+                ("Все файлы", "*.*")
+            ]
+        )
+        if not file_path:
+            return
+
+        self.load_image_btn.config(state='disabled')
 
         def load_thread():
-            self.load_image_btn.config(state='disabled')
-            if self.image_manager.load_custom_image():
-                self.update_display()
-            self.load_image_btn.config(state='normal')
+            if self.image_manager.load_image(file_path):
+                self.root.after(0, self.update_display)
+            else:
+                self.root.after(0, self._show_load_error)
+            # Работа с виджетами только в главном потоке
+            self.root.after(0, lambda: self.load_image_btn.config(state='normal'))
 
         # Запускаем в отдельном потоке чтобы не блокировать интерфейс
         threading.Thread(target=load_thread, daemon=True).start()
 
+    def _show_load_error(self):
+        """Показывает последнюю ошибку загрузки (вызывается в главном потоке)."""
+        if self.image_manager.last_error:
+            messagebox.showerror("Ошибка", self.image_manager.last_error)
+
     def update_display(self):
         """
         Обновляет отображение изображения и гистограммы.
@@ -175,13 +225,8 @@ class MainApplication:
         photo_image = self.image_manager.get_scaled_image(canvas_width - 10, canvas_height - 10)
 
         if photo_image:
-            # Очищаем холст
-            self.image_canvas.delete("all")
-
             # Отображаем изображение по центру
-            x = canvas_width // 2
-            y = canvas_height // 2
-            self.image_canvas.create_image(x, y, image=photo_image)
+            self._show_image(photo_image, canvas_width, canvas_height)
 
             # Обновляем информацию об изображении
             image = self.image_manager.current_image
@@ -191,29 +236,55 @@ class MainApplication:
                     text=f"Размер: {width}×{height} пикселей | Формат: {image.format or 'N/A'}"
                 )
 
-        # Обновляем гистограмму
-        image_data = self.image_manager.get_image_data()
-        if image_data:
-            self.histogram_manager.update_histogram(self.histogram_container, image_data)
-            histogram_canvas = self.histogram_manager.canvas
+        # Обновляем гистограмму по кешированному numpy-массиву изображения
+        img_array = self.image_manager.get_image_array()
+        if img_array is not None:
+            histogram_canvas = self.histogram_manager.update_histogram(
+                self.histogram_container, img_array, self.root
+            )
             if histogram_canvas:
-                histogram_canvas.get_tk_widget().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+                histogram_canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
-        # Планируем следующее обновление для корректного масштабирования
-        self.root.after(100, self.finalize_display)
+    def _on_canvas_resize(self, event):
+        """
+        Обрабатывает изменение размеров холста изображения.
 
-    def finalize_display(self):
+        Args:
+            event (tk.Event): Событие <Configure> с новыми размерами холста
         """
-        Завершающее обновление отображения после полной отрисовки интерфейса.
+        # Если размеры холста не изменились, повторная отрисовка не нужна
+        if (event.width, event.height) == self._last_canvas_size:
+            return
+        self._last_canvas_size = (event.width, event.height)
+
+        # Сливаем серию событий изменения размера в одно отложенное обновление
+        if self._resize_after_id is not None:
+            self.root.after_cancel(self._resize_after_id)
+        self._resize_after_id = self.root.after(100, self._apply_resize)
+
+    def _apply_resize(self):
+        """Выполняет отложенное обновление отображения после изменения размеров."""
+        self._resize_after_id = None
+        self.update_display()
+
+    def _show_image(self, photo_image, canvas_width, canvas_height):
         """
-        # Повторно обновляем для корректного масштабирования
-        canvas_width = self.image_canvas.winfo_width()
-        canvas_height = self.image_canvas.winfo_height()
+        Выводит изображение по центру холста, переиспользуя элемент холста.
 
-        if canvas_width > 10 and canvas_height > 10:
-            photo_image = self.image_manager.get_scaled_image(canvas_width - 10, canvas_height - 10)
-            if photo_image:
-                self.image_canvas.delete("all")
-                x = canvas_width // 2
-                y = canvas_height // 2
-                self.image_canvas.create_image(x, y, image=photo_image)
\ No newline at end of file
+        Args:
+            photo_image (ImageTk.PhotoImage): Изображение для отображения
+            canvas_width (int): Текущая ширина холста
+            canvas_height (int): Текущая высота холста
+        """
+        x = canvas_width // 2
+        y = canvas_height // 2
+
+        # Обновляем существующий элемент вместо удаления и пересоздания
+        if self._image_item is None:
+            self._image_item = self.image_canvas.create_image(x, y, image=photo_image)
+        else:
+            self.image_canvas.itemconfig(self._image_item, image=photo_image)
+            self.image_canvas.coords(self._image_item, x, y)
+
+        # Храним ссылку, чтобы PhotoImage не удалился сборщиком мусора
+        self._current_photo = photo_image
\ No newline at end of file
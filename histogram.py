@@ -2,65 +2,132 @@
 Модуль для расчета гистограммы RGB и создания графиков.
 """
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import threading
+import tkinter as tk
+
 import numpy as np
 
+# Максимальное количество пикселей, используемое при расчете гистограммы.
+# Для трех столбцов с процентами полное разрешение не требуется.
+MAX_HISTOGRAM_PIXELS = 250_000
+
+# Размеры холста гистограммы и отступы области построения
+CANVAS_WIDTH = 500
+CANVAS_HEIGHT = 400
+MARGIN_LEFT = 60
+MARGIN_RIGHT = 20
+MARGIN_TOP = 50
+MARGIN_BOTTOM = 40
+
+# Маски старших битов каналов R, G, B внутри 24-байтового блока пикселей.
+# Период каналов (3 байта) укладывается в блок из трех uint64-слов, поэтому
+# popcount замаскированного слова считает сразу 8 байтов одного канала.
+# np.bitwise_count доступен начиная с NumPy 2.0
+if hasattr(np, 'bitwise_count'):
+    _CHANNEL_MSB_MASKS = np.stack([
+        np.where(np.arange(24) % 3 == channel, 0x80, 0).astype(np.uint8).view(np.uint64)
+        for channel in range(3)
+    ])
+else:
+    _CHANNEL_MSB_MASKS = None
+
 
 class HistogramManager:
     """
     Класс для управления гистограммами RGB.
 
     Attributes:
-        figure (matplotlib.figure.Figure): Фигура для построения гистограммы
-        canvas (FigureCanvasTkAgg): Холст для отображения гистограммы в Tkinter
+        canvas (tk.Canvas): Холст для отображения гистограммы в Tkinter
     """
 
     def __init__(self):
         """Инициализация менеджера гистограмм."""
-        self.figure = None
         self.canvas = None
+        self._bar_items = []
+        self._text_items = []
+        self._last_image_key = None
 
     @staticmethod
-    def calculate_rgb_histogram(image):
+    def calculate_rgb_histogram(img_array):
         """
         Вычисляет гистограмму RGB для изображения.
 
         Args:
-            image (PIL.Image): Изображение для анализа
+            img_array (numpy.ndarray): Пиксели изображения для анализа
 
         Returns:
             tuple: Кортеж с данными гистограммы (r_data, g_data, b_data, total_pixels)
         """
-        if image is None:
+        if img_array is None:
             return None, None, None, 0
 
-        # Конвертируем изображение в numpy array
-        img_array = np.array(image)
+        # Прореживаем большие изображения до фиксированного бюджета пикселей:
+        # проценты каналов при этом статистически не меняются
+        scale = int(np.sqrt(img_array.shape[0] * img_array.shape[1] / MAX_HISTOGRAM_PIXELS))
+        if scale > 1:
+            img_array = img_array[::scale, ::scale]
 
-        # Если изображение в градациях серого, конвертируем в RGB
+        # Если изображение в градациях серого, каналы совпадают -
+        # достаточно одного прохода по массиву
         if len(img_array.shape) == 2:
-            img_array = np.stack([img_array] * 3, axis=-1)
-
-        # Разделяем каналы
-        if img_array.shape[2] == 4:  # Если есть альфа-канал
-            r_channel = img_array[:, :, 0]
-            g_channel = img_array[:, :, 1]
-            b_channel = img_array[:, :, 2]
-        else:  # RGB
-            r_channel = img_array[:, :, 0]
-            g_channel = img_array[:, :, 1]
-            b_channel = img_array[:, :, 2]
+            total_pixels = img_array.size
+            if img_array.dtype == np.uint8:
+                pixels = np.count_nonzero(img_array & 0x80)
+            else:
+                # Битовый трюк применим только к uint8
+                pixels = np.count_nonzero(img_array > 127)
+            return pixels, pixels, pixels, total_pixels
 
-        # Вычисляем количество пикселей каждого канала
-        total_pixels = r_channel.size
+        # Берем только RGB каналы (альфа-канал отбрасывается)
+        rgb = img_array[:, :, :3]
 
-        r_pixels = np.sum(r_channel > 128)
-        g_pixels = np.sum(g_channel > 128)
-        b_pixels = np.sum(b_channel > 128)
+        # Вычисляем количество пикселей каждого канала за один проход.
+        # Тест "выше середины шкалы" для uint8 — это просто старший бит байта,
+        # поэтому вместо сравнения достаточно битовой маски 0x80
+        total_pixels = rgb.shape[0] * rgb.shape[1]
+        r_pixels, g_pixels, b_pixels = HistogramManager._count_msb_per_channel(rgb)
 
         return r_pixels, g_pixels, b_pixels, total_pixels
 
+    @staticmethod
+    def _count_msb_per_channel(rgb):
+        """
+        Считает пиксели со старшим битом в каждом из каналов RGB.
+
+        При наличии np.bitwise_count пиксели просматриваются 64-битными
+        словами: popcount маскированного слова обрабатывает 8 байтов канала
+        за одну инструкцию вместо побайтового сравнения.
+
+        Args:
+            rgb (numpy.ndarray): Массив пикселей формы (H, W, 3) типа uint8
+
+        Returns:
+            numpy.ndarray: Количество пикселей выше середины шкалы по каналам
+        """
+        # Битовый трюк применим только к uint8: для прочих типов (float,
+        # 16-битные PNG и т.п.) используем обычное сравнение с порогом
+        if rgb.dtype != np.uint8:
+            return np.count_nonzero(rgb > 127, axis=(0, 1))
+
+        if _CHANNEL_MSB_MASKS is None:
+            return np.count_nonzero(rgb & 0x80, axis=(0, 1))
+
+        # Прореженный срез не является непрерывным в памяти - уплотняем
+        flat = np.ascontiguousarray(rgb).reshape(-1)
+        split = flat.size - flat.size % 24
+        words = flat[:split].view(np.uint64).reshape(-1, 3)
+
+        counts = np.empty(3, dtype=np.int64)
+        for channel in range(3):
+            counts[channel] = np.bitwise_count(words & _CHANNEL_MSB_MASKS[channel]).sum()
+
+        # Хвост, не кратный 24 байтам, досчитываем побайтово
+        tail = flat[split:]
+        if tail.size:
+            counts += np.count_nonzero(tail.reshape(-1, 3) & 0x80, axis=0)
+
+        return counts
+
     def create_histogram(self, parent_frame, r_data, g_data, b_data, total_pixels):
         """
         Создает гистограмму RGB в указанном фрейме.
@@ -73,73 +140,124 @@ class HistogramManager:
             total_pixels (int): Общее количество пикселей
 
         Returns:
-            FigureCanvasTkAgg: Холст с гистограммой
+            tk.Canvas: Холст с гистограммой
         """
-        # Очищаем предыдущую гистограмму
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-
-        # Создаем новую фигуру
-        self.figure = plt.Figure(figsize=(5, 4), dpi=100)
-        ax = self.figure.add_subplot(111)
+        # Холст и элементы создаются один раз, дальше только обновляются
+        if self.canvas is None:
+            self._build_canvas(parent_frame)
 
-        # Подготавливаем данные для гистограммы
-        channels = ['Red', 'Green', 'Blue']
         values = [r_data, g_data, b_data]
-
-        # Рассчитываем проценты
         percentages = [val / total_pixels * 100 if total_pixels > 0 else 0 for val in values]
 
-        # Создаем столбчатую диаграмму
-        bars = ax.bar(channels, percentages, color=['red', 'green', 'blue'], alpha=0.7)
+        base_y = CANVAS_HEIGHT - MARGIN_BOTTOM
+        plot_height = base_y - MARGIN_TOP
 
-        # Настраиваем внешний вид
-        ax.set_title('Гистограмма RGB каналов', fontsize=14, fontweight='bold')
-        ax.set_ylabel('Процент пикселей (%)', fontsize=10)
-        ax.set_ylim(0, 100)
+        # Обновляем координаты столбцов и подписи на месте
+        for bar, text, percentage, value in zip(self._bar_items, self._text_items,
+                                                percentages, values):
+            x0, _, x1, _ = self.canvas.coords(bar)
+            top_y = base_y - percentage / 100 * plot_height
+            self.canvas.coords(bar, x0, top_y, x1, base_y)
 
-        # Добавляем значения на столбцы
-        for bar, percentage, value in zip(bars, percentages, values):
-            height = bar.get_height()
-            if height < 10:
-                y_pos = height + 2
+            if percentage < 10:
+                text_y = top_y - 5
                 color = 'black'
-                va = 'bottom'
+                anchor = tk.S
             else:
-                y_pos = height / 2
+                text_y = (top_y + base_y) / 2
                 color = 'white'
-                va = 'center'
-
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.,
-                y_pos,
-                f'{percentage:.1f}%\n({value})',
-                ha='center',
-                va=va,
-                fontsize=9,
-                color=color,
-                fontweight='bold'
-            )
-
-        # Добавляем сетку для лучшей читаемости
-        ax.grid(True, alpha=0.3, axis='y')
-
-        # Создаем холст для Tkinter
-        self.canvas = FigureCanvasTkAgg(self.figure, parent_frame)
-        self.canvas.draw()
+                anchor = tk.CENTER
+
+            self.canvas.itemconfig(text, text=f'{percentage:.1f}%\n({value})',
+                                   fill=color, anchor=anchor)
+            self.canvas.coords(text, (x0 + x1) / 2, text_y)
 
         return self.canvas
 
-    def update_histogram(self, parent_frame, image):
+    def _build_canvas(self, parent_frame):
+        """
+        Создает холст гистограммы с осями и заготовками столбцов
+        (выполняется один раз).
+
+        Args:
+            parent_frame (tk.Frame): Родительский фрейм для гистограммы
+        """
+        self.canvas = tk.Canvas(parent_frame, width=CANVAS_WIDTH, height=CANVAS_HEIGHT,
+                                bg='white', highlightthickness=0)
+
+        base_y = CANVAS_HEIGHT - MARGIN_BOTTOM
+        plot_width = CANVAS_WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+        plot_height = base_y - MARGIN_TOP
+
+        # Заголовок
+        self.canvas.create_text(CANVAS_WIDTH / 2, MARGIN_TOP / 2,
+                                text='Гистограмма RGB каналов',
+                                font=('Arial', 14, 'bold'))
+
+        # Горизонтальная сетка и подписи оси процентов
+        for tick in range(0, 101, 25):
+            y = base_y - tick / 100 * plot_height
+            self.canvas.create_line(MARGIN_LEFT, y, CANVAS_WIDTH - MARGIN_RIGHT, y,
+                                    fill='#dddddd')
+            self.canvas.create_text(MARGIN_LEFT - 8, y, text=f'{tick}%',
+                                    anchor=tk.E, font=('Arial', 9))
+
+        # Столбцы (нулевой высоты) и подписи каналов
+        channels = ['Red', 'Green', 'Blue']
+        colors = ['red', 'green', 'blue']
+        bar_width = plot_width / 3 * 0.6
+
+        for i, (channel, color) in enumerate(zip(channels, colors)):
+            center_x = MARGIN_LEFT + plot_width * (i + 0.5) / 3
+            x0 = center_x - bar_width / 2
+            x1 = center_x + bar_width / 2
+
+            bar = self.canvas.create_rectangle(x0, base_y, x1, base_y,
+                                               fill=color, outline=color)
+            text = self.canvas.create_text(center_x, base_y, text='',
+                                           font=('Arial', 9, 'bold'), justify=tk.CENTER)
+            self.canvas.create_text(center_x, base_y + 15, text=channel,
+                                    font=('Arial', 10))
+
+            self._bar_items.append(bar)
+            self._text_items.append(text)
+
+    def update_histogram(self, parent_frame, img_array, root):
         """
         Обновляет гистограмму на основе текущего изображения.
 
+        Подсчет пикселей выполняется в фоновом потоке, чтобы не блокировать
+        интерфейс; результат применяется к холсту в главном потоке.
+
         Args:
             parent_frame (tk.Frame): Родительский фрейм для гистограммы
-            image (PIL.Image): Изображение для анализа
+            img_array (numpy.ndarray): Пиксели изображения для анализа
+            root (tk.Tk): Главное окно для планирования обновления холста
 
         Returns:
-            FigureCanvasTkAgg: Обновленный холст с гистограммой
+            tk.Canvas: Холст с гистограммой (обновится после пересчета)
         """
-        r_data, g_data, b_data, total_pixels = self.calculate_rgb_histogram(image)
-        return self.create_histogram(parent_frame, r_data, g_data, b_data, total_pixels)
\ No newline at end of file
+        # Холст создаем сразу, чтобы вызывающий код мог его разместить
+        if self.canvas is None:
+            self._build_canvas(parent_frame)
+
+        # Если изображение не менялось, пересчет и перерисовка не нужны
+        image_key = id(img_array)
+        if image_key == self._last_image_key:
+            return self.canvas
+        self._last_image_key = image_key
+
+        def histogram_thread():
+            data = self.calculate_rgb_histogram(img_array)
+
+            def apply_result():
+                # Отбрасываем устаревший результат, если изображение
+                # успело смениться, пока шел подсчет
+                if image_key == self._last_image_key:
+                    self.create_histogram(parent_frame, *data)
+
+            # Работа с виджетами только в главном потоке
+            root.after(0, apply_result)
+
+        threading.Thread(target=histogram_thread, daemon=True).start()
+        return self.canvas
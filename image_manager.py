@@ -4,19 +4,24 @@
 """
 
 import os
+import numpy as np
 from PIL import Image, ImageTk
-from tkinter import filedialog, messagebox
 
 
 class ImageManager:
     """
     Класс для управления изображениями приложения.
 
+    Методы загрузки могут вызываться из фоновых потоков, поэтому класс
+    не обращается к виджетам Tk: ошибки сохраняются в last_error, а их
+    показ остается за графическим интерфейсом.
+
     Attributes:
         current_image_index (int): Индекс текущего изображения в карусели
         image_paths (list): Список путей к предустановленным изображениям
         current_image (PIL.Image): Текущее загруженное изображение
         current_photo_image (ImageTk.PhotoImage): Изображение для отображения в Tkinter
+        last_error (str): Сообщение о последней ошибке загрузки или None
     """
 
     def __init__(self):
@@ -25,10 +30,9 @@ class ImageManager:
         self.image_paths = self._get_default_images()
         self.current_image = None
         self.current_photo_image = None
-
-        # Загружаем первое изображение по умолчанию
-        if self.image_paths:
-            self.load_image(self.image_paths[0])
+        self.last_error = None
+        self._current_array = None
+        self._scale_cache = (None, None)
 
     @staticmethod
     def _get_default_images():
@@ -42,13 +46,15 @@ class ImageManager:
         if not os.path.exists("images"):
             os.makedirs("images")
 
-        # Ищем изображения в папке
-        image_extensions = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+        # Ищем изображения в папке: os.scandir отдает записи с кешированными
+        # атрибутами, а проверка расширения через множество выполняется за O(1)
+        image_extensions = frozenset({'png', 'jpg', 'jpeg', 'bmp', 'gif'})
         image_paths = []
 
-        for file in os.listdir("images"):
-            if file.lower().endswith(image_extensions):
-                image_paths.append(os.path.join("images", file))
+        with os.scandir("images") as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.rpartition('.')[2].lower() in image_extensions:
+                    image_paths.append(entry.path)
 
         # Если изображений нет, создаем сообщение
         if not image_paths:
@@ -56,6 +62,18 @@ class ImageManager:
 
         return image_paths
 
+    def load_initial_image(self):
+        """
+        Загружает первое изображение карусели.
+        Вызывается из фонового потока, чтобы не блокировать запуск интерфейса.
+
+        Returns:
+            bool: Успешно ли загружено изображение
+        """
+        if not self.image_paths:
+            return False
+        return self.load_image(self.image_paths[self.current_image_index])
+
     def load_image(self, image_path):
         """
         Загружает изображение из указанного пути.
@@ -67,10 +85,16 @@ class ImageManager:
             bool: Успешно ли загружено изображение
         """
         try:
-            self.current_image = Image.open(image_path)
+            image = Image.open(image_path)
+            # Image.open ленивый: декодируем пиксели сразу и кешируем
+            # numpy-представление, чтобы не декодировать повторно
+            image.load()
+            self.current_image = image
+            self._current_array = np.asarray(image)
+            self.last_error = None
             return True
         except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось загрузить изображение: {str(e)}")
+            self.last_error = f"Не удалось загрузить изображение: {str(e)}"
             return False
 
     def get_scaled_image(self, max_width, max_height):
@@ -94,9 +118,17 @@ class ImageManager:
         new_width = int(original_width * ratio)
         new_height = int(original_height * ratio)
 
-        # Масштабируем изображение
-        scaled_image = self.current_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Возвращаем кешированный результат, если изображение и размеры не менялись
+        cache_key = (id(self.current_image), new_width, new_height)
+        if self._scale_cache[0] == cache_key:
+            return self._scale_cache[1]
+
+        # Масштабируем изображение: для экранного предпросмотра BILINEAR
+        # в разы быстрее LANCZOS, а при сильном уменьшении BOX еще быстрее
+        resample = Image.Resampling.BOX if ratio < 0.5 else Image.Resampling.BILINEAR
+        scaled_image = self.current_image.resize((new_width, new_height), resample)
         self.current_photo_image = ImageTk.PhotoImage(scaled_image)
+        self._scale_cache = (cache_key, self.current_photo_image)
 
         return self.current_photo_image
 
@@ -108,36 +140,16 @@ class ImageManager:
             bool: Успешно ли переключено изображение
         """
         if not self.image_paths:
-            messagebox.showwarning("Предупреждение", "Нет доступных изображений в папке 'images'")
             return False
 
         self.current_image_index = (self.current_image_index + 1) % len(self.image_paths)
         return self.load_image(self.image_paths[self.current_image_index])
 
-    def load_custom_image(self):
-        """
-        Загружает пользовательское изображение через диалог выбора файла.
-
-        Returns:
-            bool: Успешно ли загружено изображение
-        """
-        file_path = filedialog.askopenfilename(
-            title="Выберите изображение",
-            filetypes=[
-                ("Изображения", "*.png *.jpg *.jpeg *.bmp *.gif"),
-                ("Все файлы", "*.*")
-            ]
-        )
-
-        if file_path:
-            return self.load_image(file_path)
-        return False
-
-    def get_image_data(self):
+    def get_image_array(self):
         """
-        Возвращает данные текущего изображения для анализа.
+        Возвращает кешированный numpy-массив текущего изображения.
 
         Returns:
-            PIL.Image: Текущее изображение или None если изображение не загружено
+            numpy.ndarray: Декодированные пиксели или None если изображение не загружено
         """
-        return self.current_image
\ No newline at end of file
+        return self._current_array
\ No newline at end of file